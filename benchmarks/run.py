@@ -0,0 +1,228 @@
+import argparse
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import statistics
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for lab in ('lab1', 'lab2', 'lab3', 'lab4', 'lab5', 'lab7'):
+    sys.path.insert(0, os.path.join(ROOT, lab))
+# lab2 читает шрифт по пути относительно корня проекта; пути из аргументов считаем от исходного каталога
+CWD = os.getcwd()
+os.chdir(ROOT)
+
+from lab1 import Vector2d
+from lab2 import Printer, Color
+from laba3 import Logger, FileHandler, SimpleLogFilter
+from laba4 import Person
+from laba5 import User, UserRepository
+from laba7 import Injector, LifeStyle, IServiceA, IServiceB, IServiceC, ServiceADebug, ServiceBDebug, ServiceCDebug
+
+# name -> (функция подготовки, число вызовов в одном замере)
+SCENARIOS: Dict[str, tuple[Callable[[str], Callable[[], Any]], int]] = {}
+
+
+def scenario(name: str, number: int):
+    def register(setup: Callable[[str], Callable[[], Any]]):
+        SCENARIOS[name] = (setup, number)
+        return setup
+    return register
+
+
+# Сценарии: setup(tmpdir) готовит данные и возвращает измеряемую функцию
+
+@scenario('lab1.vector_ops', number=200)
+def vector_ops(tmpdir: str) -> Callable[[], Any]:
+    vectors = [Vector2d(i % 97, i % 89) for i in range(1000)]
+
+    def run():
+        total = Vector2d(0, 0)
+        for first, second in zip(vectors, vectors[1:]):
+            total = total + (first - second)
+            first.dot(second)
+            first.cross(second)
+            abs(first)
+        return total
+    return run
+
+
+@scenario('lab2.render_text', number=200)
+def render_text(tmpdir: str) -> Callable[[], Any]:
+    def run():
+        with redirect_stdout(io.StringIO()):
+            Printer._render_text("HELLO WORLD", Color.GREEN, (5, 5), "#", 2)
+    return run
+
+
+@scenario('lab3.logger_file', number=20)
+def logger_file(tmpdir: str) -> Callable[[], Any]:
+    logger = Logger(filters=[SimpleLogFilter("ERROR")], handlers=[FileHandler(os.path.join(tmpdir, 'bench.log'))])
+    lines = ["ERROR: HTTP/2.0 connection error", "INFO: HTTP/1.1 request received"] * 50
+
+    def run():
+        for line in lines:
+            logger.log(line)
+    return run
+
+
+@scenario('lab4.setter_fanout', number=200)
+def setter_fanout(tmpdir: str) -> Callable[[], Any]:
+    class Listener:
+        def on_property_changed(self, obj: Any, property_name: str) -> None:
+            pass
+
+    class Validator:
+        def on_property_changing(self, obj: Any, property_name: str, old_value: Any, new_value: Any) -> bool:
+            return True
+
+    person = Person("Yura", 19)
+    for _ in range(20):
+        person.add_property_changed_listener(Listener())
+    for _ in range(5):
+        person.add_property_changing_listener(Validator())
+
+    def run():
+        for age in range(100):
+            person.age = age
+    return run
+
+
+@scenario('lab5.repository_add', number=5)
+def repository_add(tmpdir: str) -> Callable[[], Any]:
+    filename = os.path.join(tmpdir, 'users_add.json')
+
+    def run():
+        if os.path.exists(filename):
+            os.remove(filename)
+        repo = UserRepository(filename)
+        for i in range(100):
+            repo.add(User(id=i, name=f"User{i}", login=f"user{i}", password="1234"))
+    return run
+
+
+@scenario('lab5.get_by_login', number=50)
+def get_by_login(tmpdir: str) -> Callable[[], Any]:
+    repo = UserRepository(os.path.join(tmpdir, 'users_login.json'))
+    for i in range(1000):
+        repo._items[i] = User(id=i, name=f"User{i}", login=f"user{i}", password="1234")
+    repo._save()
+    logins = [f"user{i}" for i in range(0, 1000, 50)]
+
+    def run():
+        for login in logins:
+            repo.get_by_login(login)
+    return run
+
+
+@scenario('lab7.get_instance', number=2000)
+def get_instance(tmpdir: str) -> Callable[[], Any]:
+    injector = Injector()
+    injector.register(IServiceA, ServiceADebug, LifeStyle.PER_REQUEST)
+    injector.register(IServiceB, ServiceBDebug, LifeStyle.SCOPED)
+    injector.register(IServiceC, ServiceCDebug, LifeStyle.PER_REQUEST)
+
+    def run():
+        with injector.create_scope():
+            injector.get_instance(IServiceC)
+            injector.get_instance(IServiceA)
+    return run
+
+
+# Запуск, сохранение и сравнение
+
+def measure(run: Callable[[], Any], number: int, repeat: int) -> Dict[str, float]:
+    run()
+    times = [elapsed / number for elapsed in timeit.repeat(run, number=number, repeat=repeat)]
+    return {'min': min(times), 'median': statistics.median(times), 'number': number, 'repeat': repeat}
+
+
+def profile(name: str, run: Callable[[], Any], number: int, top: int):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    for _ in range(number):
+        run()
+    profiler.disable()
+    print(f'--- cProfile: {name} ---')
+    pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
+
+
+def peak_memory(run: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_scenarios(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, (setup, number) in SCENARIOS.items():
+            if args.filter and args.filter not in name:
+                continue
+            run = setup(tmpdir)
+            results[name] = measure(run, number, args.repeat)
+            if args.tracemalloc:
+                results[name]['peak_bytes'] = peak_memory(run)
+            if args.profile:
+                profile(name, run, number, args.top)
+            print(f'{name:<24}{results[name]["median"] * 1e6:>12.2f} us'
+                  f'{results[name]["min"] * 1e6:>12.2f} us (min)')
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline_file: str, threshold: float) -> list[str]:
+    with open(os.path.join(CWD, baseline_file), 'r') as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['min'] / baseline[name]['min']
+        status = 'REGRESSION' if ratio > 1 + threshold else 'ok'
+        print(f'{name:<24}{ratio:>8.2f}x  {status}')
+        if status != 'ok':
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Project benchmarks')
+    parser.add_argument('--filter', help='run only scenarios whose name contains this string')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed slowdown of the best time before flagging a regression (0.1 = 10%%)')
+    parser.add_argument('--profile', action='store_true', help='print cProfile stats for each scenario')
+    parser.add_argument('--top', type=int, default=15, help='number of cProfile rows to print')
+    parser.add_argument('--tracemalloc', action='store_true', help='record peak memory of one run')
+    args = parser.parse_args(argv)
+
+    results = run_scenarios(args)
+
+    if args.save:
+        with open(os.path.join(CWD, args.save), 'w') as f:
+            json.dump({'python': platform.python_version(), 'results': results}, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f'Regressions beyond {args.threshold:.0%}: {", ".join(regressions)}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import random
+import sys
+from time import perf_counter
+from typing import Callable, Any
+
+from lab1 import Vector2d
+from geometry import (
+    Coord, batch_polygon_areas, batch_orientations, convex_hull,
+    any_segments_intersect, segment_intersections
+)
+
+
+# Так площади считались раньше: по одному Vector2d на вершину
+def vector_loop_area(polygon: list[Coord]) -> float:
+    total = 0
+    for i in range(len(polygon)):
+        x1, y1 = polygon[i]
+        x2, y2 = polygon[(i + 1) % len(polygon)]
+        total += Vector2d.cross_product(Vector2d(x1, y1), Vector2d(x2, y2))
+    return abs(total) / 2
+
+
+def random_polygons(vertices: int, size: int = 100) -> list[list[Coord]]:
+    return [
+        [(random.randint(0, 800), random.randint(0, 600)) for _ in range(size)]
+        for _ in range(max(1, vertices // size))
+    ]
+
+
+def disjoint_segments(count: int) -> list[tuple[Coord, Coord]]:
+    # Короткие горизонтальные отрезки без пересечений: в active почти всегда не больше одного
+    return [((i % 1000 * 3, i // 1000), (i % 1000 * 3 + 1, i // 1000)) for i in range(count)]
+
+
+def staggered_segments(count: int) -> list[tuple[Coord, Coord]]:
+    # Горизонтальные отрезки с перекрывающимися x-диапазонами: в active одновременно до count штук
+    return [((0, y), (1000 + count - y, y)) for y in range(count)]
+
+
+def random_segments(count: int) -> list[tuple[Coord, Coord]]:
+    side = count * 10
+    segments = []
+    for _ in range(count):
+        x, y = random.randint(0, side), random.randint(0, side)
+        segments.append(((x, y), (x + random.randint(-50, 50), y + random.randint(-50, 50))))
+    return segments
+
+
+def measure(func: Callable[..., Any], *args) -> float:
+    start = perf_counter()
+    func(*args)
+    return perf_counter() - start
+
+
+def bench(vertices: int):
+    polygons = random_polygons(vertices)
+    points = [point for polygon in polygons for point in polygon]
+    triples = (points, points[1:] + points[:1], points[2:] + points[:2])
+    results = {
+        'area (Vector2d loop)': measure(lambda: [vector_loop_area(p) for p in polygons]),
+        'area (batch)': measure(batch_polygon_areas, polygons),
+        'orientation (batch)': measure(batch_orientations, *triples),
+        'convex hull': measure(convex_hull, points),
+        'any (disjoint)': measure(any_segments_intersect, disjoint_segments(vertices // 2)),
+        'any (staggered)': measure(any_segments_intersect, staggered_segments(vertices // 2)),
+        'all (random)': measure(segment_intersections, random_segments(vertices // 2)),
+        'all (staggered)': measure(segment_intersections, staggered_segments(vertices // 2)),
+    }
+    print(f'n = {vertices:>8}')
+    for name, elapsed in results.items():
+        print(f'  {name:<22}{elapsed * 1e3:>12.2f} ms')
+
+
+if __name__ == '__main__':
+    random.seed(0)
+    max_exp = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    for exp in range(2, max_exp + 1):
+        bench(10 ** exp)
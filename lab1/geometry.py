@@ -0,0 +1,249 @@
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+from heapq import heappush, heappop
+from itertools import combinations
+from operator import mul
+from typing import Iterable, Sequence
+
+from lab1 import Point2d, Vector2d
+
+Coord = tuple[int, int]
+Segment = tuple[Coord, Coord]
+
+
+def _xy(point: Point2d | Coord) -> Coord:
+    if isinstance(point, Point2d):
+        return point.x, point.y
+    return point[0], point[1]
+
+
+def to_coords(points: Iterable[Point2d | Coord]) -> list[Coord]:
+    return [_xy(point) for point in points]
+
+
+def _sign(value: int | float) -> int:
+    return (value > 0) - (value < 0)
+
+
+# Одиночные операции на Point2d/Vector2d
+
+def orientation(a: Point2d, b: Point2d, c: Point2d) -> int:
+    # 1 - поворот против часовой стрелки, -1 - по часовой, 0 - точки на одной прямой
+    return _sign(Vector2d.cross_product(Vector2d.from_points(a, b), Vector2d.from_points(a, c)))
+
+
+def polygon_area(polygon: Sequence[Point2d | Coord]) -> float:
+    return abs(signed_area(to_coords(polygon)))
+
+
+# Пакетные ядра: работают с кортежами координат, циклы уходят в map/zip
+
+def _cross(o: Coord, a: Coord, b: Coord) -> int:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def signed_area(coords: Sequence[Coord]) -> float:
+    # Формула шнурков; > 0 для обхода против часовой стрелки
+    if len(coords) < 3:
+        return 0.0
+    xs, ys = zip(*coords)
+    shifted_xs = xs[1:] + xs[:1]
+    shifted_ys = ys[1:] + ys[:1]
+    return (sum(map(mul, xs, shifted_ys)) - sum(map(mul, ys, shifted_xs))) / 2
+
+
+def batch_polygon_areas(polygons: Iterable[Sequence[Coord]]) -> list[float]:
+    return [abs(signed_area(polygon)) for polygon in polygons]
+
+
+def batch_orientations(a: Sequence[Coord], b: Sequence[Coord], c: Sequence[Coord]) -> list[int]:
+    return [_sign(_cross(o, p, q)) for o, p, q in zip(a, b, c)]
+
+
+def convex_hull(points: Iterable[Point2d | Coord]) -> list[Coord]:
+    # Монотонная цепочка Эндрю, O(n log n); вершины против часовой стрелки без коллинеарных
+    coords = sorted(set(to_coords(points)))
+    if len(coords) <= 2:
+        return coords
+
+    def half(chain: Iterable[Coord]) -> list[Coord]:
+        hull: list[Coord] = []
+        for point in chain:
+            while len(hull) >= 2 and _cross(hull[-2], hull[-1], point) <= 0:
+                hull.pop()
+            hull.append(point)
+        return hull
+
+    lower = half(coords)
+    upper = half(reversed(coords))
+    return lower[:-1] + upper[:-1]
+
+
+# Пересечение отрезков
+
+def _on_segment(p: Coord, q: Coord, r: Coord) -> bool:
+    # r лежит на прямой pq; проверяем, что и внутри ограничивающего прямоугольника
+    return min(p[0], q[0]) <= r[0] <= max(p[0], q[0]) and min(p[1], q[1]) <= r[1] <= max(p[1], q[1])
+
+
+def segments_intersect(first: Segment, second: Segment) -> bool:
+    p1, p2 = first
+    p3, p4 = second
+    d1 = _sign(_cross(p3, p4, p1))
+    d2 = _sign(_cross(p3, p4, p2))
+    d3 = _sign(_cross(p1, p2, p3))
+    d4 = _sign(_cross(p1, p2, p4))
+    if d1 != d2 and d3 != d4 and d1 and d2 and d3 and d4:
+        return True
+    return (
+        (d1 == 0 and _on_segment(p3, p4, p1))
+        or (d2 == 0 and _on_segment(p3, p4, p2))
+        or (d3 == 0 and _on_segment(p1, p2, p3))
+        or (d4 == 0 and _on_segment(p1, p2, p4))
+    )
+
+
+def _normalize(segments: Iterable[Segment]) -> list[Segment]:
+    normalized = []
+    for start, end in segments:
+        start, end = _xy(start), _xy(end)
+        normalized.append((start, end) if start <= end else (end, start))
+    return normalized
+
+
+def _side(segment: Segment, point: tuple) -> int:
+    # Положение отрезка относительно точки на заметающей прямой: -1 ниже, 0 проходит через неё, 1 выше.
+    # Вертикальный отрезок считается проходящим через точку, пока она в его пределах
+    (x1, y1), (x2, y2) = segment
+    if x1 == x2:
+        return -1 if y2 < point[1] else (1 if y1 > point[1] else 0)
+    return -_sign(_cross(segment[0], segment[1], point))
+
+
+def any_segments_intersect(segments: Iterable[Segment]) -> bool:
+    # Шамос-Хоуи: заметающая прямая слева направо, O(n log n).
+    # Порядок отрезков по y не меняется до первого пересечения, которое
+    # обязательно окажется между соседями в active, поэтому позиции ищутся бинарным поиском
+    segs = _normalize(segments)
+    starts: dict[Coord, list[int]] = {}
+    for i, (left, _) in enumerate(segs):
+        starts.setdefault(left, []).append(i)
+    points = sorted({point for segment in segs for point in segment})
+
+    active: list[int] = []
+    for point in points:
+        def side(i: int) -> int:
+            return _side(segs[i], point)
+
+        lo = bisect_left(active, 0, key=side)
+        hi = bisect_right(active, 0, key=side, lo=lo)
+        involved = active[lo:hi] + starts.get(point, [])
+        if len(involved) > 1:
+            return True
+        if not involved:
+            continue
+
+        i = involved[0]
+        if hi > lo:
+            # Единственный отрезок через точку - заканчивающийся в ней
+            del active[lo]
+            if 0 < lo < len(active) and segments_intersect(segs[active[lo - 1]], segs[active[lo]]):
+                return True
+        elif segs[i][1] != point:
+            active.insert(lo, i)
+            if lo > 0 and segments_intersect(segs[active[lo - 1]], segs[i]):
+                return True
+            if lo + 1 < len(active) and segments_intersect(segs[active[lo + 1]], segs[i]):
+                return True
+    return False
+
+
+def _crossing_point(first: Segment, second: Segment) -> tuple[Fraction, Fraction] | None:
+    # Точка пересечения непараллельных отрезков в точной рациональной арифметике
+    (x1, y1), (x2, y2) = first
+    (x3, y3), (x4, y4) = second
+    denominator = (x2 - x1) * (y4 - y3) - (y2 - y1) * (x4 - x3)
+    if denominator == 0:
+        return None
+    numerator = (x3 - x1) * (y4 - y3) - (y3 - y1) * (x4 - x3)
+    return (Fraction(x1 * denominator + numerator * (x2 - x1), denominator),
+            Fraction(y1 * denominator + numerator * (y2 - y1), denominator))
+
+
+def _slope_key(segment: Segment) -> tuple:
+    # Порядок отрезков снизу вверх сразу справа от общей точки; вертикальные выше всех
+    (x1, y1), (x2, y2) = segment
+    if x1 == x2:
+        return 1, 0
+    return 0, Fraction(y2 - y1, x2 - x1)
+
+
+def segment_intersections(segments: Iterable[Segment]) -> list[tuple[int, int]]:
+    # Бентли-Оттман: события - концы отрезков и найденные точки пересечения,
+    # статус - отрезки под заметающей прямой, упорядоченные по y.
+    # O((n + k) log n), где k - число точек пересечения. Индексы в парах упорядочены: i < j
+    segs = _normalize(segments)
+    starts: dict[Coord, list[int]] = {}
+    events: list[tuple] = []
+    queued: set[tuple] = set()
+
+    def push(point: tuple):
+        if point not in queued:
+            queued.add(point)
+            heappush(events, point)
+
+    for i, (left, right) in enumerate(segs):
+        starts.setdefault(left, []).append(i)
+        push(left)
+        push(right)
+
+    def check(i: int, j: int, point: tuple):
+        if segments_intersect(segs[i], segs[j]):
+            crossing = _crossing_point(segs[i], segs[j])
+            # Совпадающие коллинеарные отрезки обнаружатся в событии конца одного из них
+            if crossing is not None and crossing > point:
+                push(crossing)
+
+    status: list[int] = []
+    found: set[tuple[int, int]] = set()
+    while events:
+        point = heappop(events)
+        queued.discard(point)
+
+        def side(i: int) -> int:
+            return _side(segs[i], point)
+
+        lo = bisect_left(status, 0, key=side)
+        hi = bisect_right(status, 0, key=side, lo=lo)
+        involved = status[lo:hi] + starts.get(point, [])
+        if len(involved) > 1:
+            found.update((i, j) if i < j else (j, i) for i, j in combinations(involved, 2))
+
+        # Отрезки, продолжающиеся правее точки, вставляются заново в новом порядке
+        continuing = sorted(
+            (i for i in involved if segs[i][1] != point), key=lambda i: _slope_key(segs[i])
+        )
+        status[lo:hi] = continuing
+        if not continuing:
+            if 0 < lo < len(status):
+                check(status[lo - 1], status[lo], point)
+        else:
+            if lo > 0:
+                check(status[lo - 1], status[lo], point)
+            top = lo + len(continuing)
+            if top < len(status):
+                check(status[top - 1], status[top], point)
+    return sorted(found)
+
+
+if __name__ == "__main__":
+    square = [Point2d(0, 0), Point2d(100, 0), Point2d(100, 100), Point2d(0, 100)]
+    print(f"Square area: {polygon_area(square)}")
+    print(f"Orientation: {orientation(*square[:3])}")
+
+    points = to_coords(square) + [(50, 50), (20, 80)]
+    print(f"Convex hull: {convex_hull(points)}")
+
+    segments = [((0, 0), (100, 100)), ((0, 100), (100, 0)), ((200, 0), (300, 0))]
+    print(f"Any intersection: {any_segments_intersect(segments)}")
+    print(f"Intersecting pairs: {segment_intersections(segments)}")
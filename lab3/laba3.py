@@ -1,5 +1,6 @@
-from typing import Protocol, List
-import re, socket
+from collections import OrderedDict
+from typing import Protocol, List, Dict, Callable, Optional
+import random, re, socket, time
 
 class LogFilterProtocol(Protocol):
     def match(self, text: str) -> bool: ...
@@ -7,6 +8,12 @@ class LogFilterProtocol(Protocol):
 class LogHandlerProtocol(Protocol):
     def handle(self, text: str) -> None: ...
 
+class LogStageProtocol(Protocol):
+    suppressed: int
+
+    def process(self, text: str) -> List[str]: ...
+    def flush(self) -> List[str]: ...
+
 class SimpleLogFilter(LogFilterProtocol):
     def __init__(self, pattern: str):
         self.pattern = pattern
@@ -61,18 +68,152 @@ class SyslogHandler(LogHandlerProtocol):
     def handle(self, text: str) -> None:
         print(f"\033[93m[SYSLOG] {text}\033[0m")
 
+class SummaryRecord(str):
+    # Сводка стадии; следующие стадии пропускают её без ограничений
+    pass
+
+def filter_key(filters: List[LogFilterProtocol]) -> Callable[[str], str]:
+    def key(text: str) -> str:
+        for i, log_filter in enumerate(filters):
+            if log_filter.match(text):
+                return str(i)
+        return ''
+    return key
+
+class RateLimitStage(LogStageProtocol):
+    def __init__(self, rate: float, burst: int, key: Optional[Callable[[str], str]] = None,
+                 max_keys: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.key = key
+        self.max_keys = max_keys
+        self.clock = clock
+        self.suppressed = 0
+        # key -> [токены, время последнего пополнения]; самые старые ключи вытесняются
+        self._buckets: OrderedDict[str, List[float]] = OrderedDict()
+
+    def process(self, text: str) -> List[str]:
+        key = self.key(text) if self.key else ''
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return [text]
+        self.suppressed += 1
+        return []
+
+    def flush(self) -> List[str]:
+        return []
+
+class SamplingStage(LogStageProtocol):
+    def __init__(self, probability: float, rng: Optional[random.Random] = None):
+        self.probability = probability
+        self.rng = rng or random.Random()
+        self.suppressed = 0
+
+    def process(self, text: str) -> List[str]:
+        if self.rng.random() < self.probability:
+            return [text]
+        self.suppressed += 1
+        return []
+
+    def flush(self) -> List[str]:
+        return []
+
+class DeduplicateStage(LogStageProtocol):
+    def __init__(self, window: float, max_keys: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.max_keys = max_keys
+        self.clock = clock
+        self.suppressed = 0
+        # text -> [начало окна, число подавленных повторов]
+        self._recent: OrderedDict[str, List[float]] = OrderedDict()
+
+    @staticmethod
+    def _summary(text: str, repeats: int) -> List[str]:
+        return [SummaryRecord(f"{text} (repeated {repeats} times)")] if repeats else []
+
+    def process(self, text: str) -> List[str]:
+        now = self.clock()
+        records = []
+        # Записи упорядочены по началу окна, поэтому истёкшие окна всегда в начале
+        while self._recent:
+            old_text, (start, repeats) = next(iter(self._recent.items()))
+            if now - start < self.window:
+                break
+            del self._recent[old_text]
+            records += self._summary(old_text, repeats)
+
+        entry = self._recent.get(text)
+        if entry is not None:
+            entry[1] += 1
+            self.suppressed += 1
+            return records
+
+        self._recent[text] = [now, 0]
+        if len(self._recent) > self.max_keys:
+            old_text, (_, repeats) = self._recent.popitem(last=False)
+            records += self._summary(old_text, repeats)
+        records.append(text)
+        return records
+
+    def flush(self) -> List[str]:
+        records = []
+        for text, entry in self._recent.items():
+            records += self._summary(text, entry[1])
+            entry[1] = 0
+        return records
+
 class Logger:
-    def __init__(self, filters: List[LogFilterProtocol] = None, handlers: List[LogHandlerProtocol] = None):
+    def __init__(self, filters: List[LogFilterProtocol] = None, handlers: List[LogHandlerProtocol] = None,
+                 stages: List[LogStageProtocol] = None):
         self.filters = filters if filters else []
         self.handlers = handlers if handlers else []
+        self.stages = stages if stages else []
 
     def log(self, text: str) -> None:
         if self.filters and not any(f.match(text) for f in self.filters):
             return
 
+        if self.stages:
+            self._emit(self._run_stages([text], 0))
+            return
+
         for handler in self.handlers:
             handler.handle(text)
 
+    def flush(self) -> None:
+        for i, stage in enumerate(self.stages):
+            self._emit(self._run_stages(stage.flush(), i + 1))
+
+    def suppressed(self) -> Dict[str, int]:
+        # Ключ включает позицию стадии, чтобы одинаковые стадии не затирали друг друга
+        return {f"{i}:{type(stage).__name__}": stage.suppressed for i, stage in enumerate(self.stages)}
+
+    def _run_stages(self, records: List[str], start: int) -> List[str]:
+        for stage in self.stages[start:]:
+            if not records:
+                break
+            records = [
+                out for record in records
+                for out in ((record,) if isinstance(record, SummaryRecord) else stage.process(record))
+            ]
+        return records
+
+    def _emit(self, records: List[str]) -> None:
+        for record in records:
+            for handler in self.handlers:
+                handler.handle(record)
+
 if __name__ == "__main__":
     errorFilter = SimpleLogFilter("ERROR")
     warningFilter = SimpleLogFilter("WARNING")
@@ -110,4 +251,16 @@ if __name__ == "__main__":
 
     print("---------------\nALL logs:")
     for logText in testLogs:
-        defaultLogger.log(logText)
\ No newline at end of file
+        defaultLogger.log(logText)
+
+    print("---------------\nIncident logs:")
+    incidentLogger = Logger(
+        filters=[errorFilter],
+        handlers=[consoleHandler],
+        stages=[DeduplicateStage(window=1.0), RateLimitStage(rate=5, burst=3, key=filter_key([errorFilter]))]
+    )
+    for _ in range(1000):
+        incidentLogger.log("ERROR: HTTP/2.0 connection error")
+    incidentLogger.log("ERROR: Application is not responding")
+    incidentLogger.flush()
+    print(f"Suppressed: {incidentLogger.suppressed()}")
\ No newline at end of file
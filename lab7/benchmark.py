@@ -0,0 +1,130 @@
+from inspect import signature, isclass, Signature, Parameter
+from timeit import timeit
+from typing import Type, Any, Union, Callable
+
+from laba7 import Injector, LifeStyle, Lazy
+
+
+# Разрешение зависимостей в том виде, в котором оно было до компиляции планов
+class LegacyInjector(Injector):
+    def get_instance(self, interface: Type) -> Any:
+        impl, lifestyle, params = self._registry[interface]
+
+        if lifestyle == LifeStyle.SINGLETON:
+            if interface not in self._singletons:
+                self._singletons[interface] = self._build(impl, params)
+            return self._singletons[interface]
+
+        if lifestyle == LifeStyle.SCOPED:
+            scope = self._scoped_instances.get()
+            if scope is None:
+                raise RuntimeError('No active scope')
+            if interface not in scope.instances:
+                scope.instances[interface] = self._build(impl, params)
+            return scope.instances[interface]
+
+        return self._build(impl, params)
+
+    def _build(self, impl: Union[Type, Callable], params: dict) -> Any:
+        if callable(impl) and not isclass(impl):
+            return impl()
+
+        ctor_params = {}
+        sig = signature(impl.__init__)
+        for name, param in sig.parameters.items():
+            if param.annotation in self._registry:
+                ctor_params[name] = self.get_instance(param.annotation)
+        ctor_params.update(params)
+        return impl(**ctor_params)
+
+
+def make_chain(depth: int) -> list[type]:
+    # Каждый сервис зависит от предыдущего: Service0 <- Service1 <- ... <- ServiceN
+    services = []
+    for i in range(depth):
+        if services:
+            dep = services[-1]
+
+            def __init__(self, dep):
+                self.dep = dep
+            __init__.__annotations__ = {'dep': dep}
+        else:
+            def __init__(self):
+                self.dep = None
+        services.append(type(f'Service{i}', (), {'__init__': __init__}))
+    return services
+
+
+def configure(injector: Injector, services: list[type], lifestyle: LifeStyle) -> Injector:
+    for service in services:
+        injector.register(service, service, lifestyle)
+    return injector
+
+
+def bench_resolution(depth: int = 20, number: int = 2000):
+    services = make_chain(depth)
+    root = services[-1]
+    for lifestyle in (LifeStyle.PER_REQUEST, LifeStyle.SCOPED):
+        results = {}
+        for injector_cls in (LegacyInjector, Injector):
+            injector = configure(injector_cls(), services, lifestyle)
+
+            def resolve():
+                with injector.create_scope():
+                    injector.get_instance(root)
+
+            resolve()
+            elapsed = timeit(resolve, number=number)
+            results[injector_cls.__name__] = number / elapsed
+        speedup = results['Injector'] / results['LegacyInjector']
+        print(f'{lifestyle.value:>10} depth={depth}: '
+              f'legacy {results["LegacyInjector"]:>10.0f} res/s | '
+              f'compiled {results["Injector"]:>10.0f} res/s | x{speedup:.1f}')
+
+
+def make_request_handler(services: list[type], wrap: Callable[[type], Any]) -> type:
+    # Обработчик запроса получает все ветки графа, но использует только одну
+    def __init__(self, **branches):
+        self.branches = branches
+    __init__.__signature__ = Signature([Parameter('self', Parameter.POSITIONAL_OR_KEYWORD)] + [
+        Parameter(f'branch{i}', Parameter.KEYWORD_ONLY, annotation=wrap(service))
+        for i, service in enumerate(services)
+    ])
+    return type('RequestHandler', (), {'__init__': __init__})
+
+
+def bench_lazy_request(width: int = 20, depth: int = 10, number: int = 500):
+    branches = [make_chain(depth) for _ in range(width)]
+    heads = [chain[-1] for chain in branches]
+    variants = {
+        'eager': (make_request_handler(heads, lambda service: service), False),
+        'Lazy[T]': (make_request_handler(heads, lambda service: Lazy[service]), False),
+        'lazy=True': (make_request_handler(heads, lambda service: service), True),
+    }
+
+    results = {}
+    for variant, (handler, lazy) in variants.items():
+        injector = Injector()
+        for chain in branches:
+            for service in chain:
+                injector.register(service, service, LifeStyle.SCOPED, lazy=lazy and service in heads)
+        injector.register(handler, handler)
+
+        def request():
+            with injector.create_scope():
+                # Типичный запрос обращается только к первой ветке
+                injector.get_instance(handler).branches['branch0'].dep
+
+        request()
+        results[variant] = timeit(request, number=number) / number * 1e6
+    print(f'request scope width={width} depth={depth}: ' + ' | '.join(
+        f'{variant} {cost:>8.1f} us' for variant, cost in results.items()
+    ))
+
+
+if __name__ == '__main__':
+    for depth in (5, 20, 50):
+        bench_resolution(depth)
+
+    for width, depth in ((10, 5), (20, 10), (50, 20)):
+        bench_lazy_request(width, depth)
@@ -1,8 +1,16 @@
 from abc import ABC, abstractmethod
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar, Token
 from enum import Enum
-from inspect import signature, isclass
-from typing import Type, Any, Optional, Callable, Union
+from functools import partial
+from inspect import signature, isclass, isawaitable, Parameter
+from threading import RLock, Lock, local
+from time import perf_counter
+from typing import (
+    Type, Any, Optional, Callable, Union, TypeVar, Generic, Protocol, get_origin, get_args
+)
+
+T = TypeVar('T')
 
 
 class LifeStyle(Enum):
@@ -11,61 +19,560 @@ class LifeStyle(Enum):
     SINGLETON = 'Singleton'
 
 
+def _name(interface: Any) -> str:
+    return getattr(interface, '__name__', repr(interface))
+
+
+_MISSING = object()
+
+
+class Lazy(Generic[T]):
+    # Прокси: экземпляр создаётся при первом обращении к атрибуту
+    __slots__ = ('_factory', '_instance', '_lock')
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance = _MISSING
+        self._lock = Lock()
+
+    @property
+    def value(self) -> T:
+        if self._instance is _MISSING:
+            with self._lock:
+                if self._instance is _MISSING:
+                    self._instance = self._factory()
+                    # Фабрика держит захваченный скоуп, после разрешения он больше не нужен
+                    self._factory = None
+        return self._instance
+
+    @property
+    def is_resolved(self) -> bool:
+        return self._instance is not _MISSING
+
+    # Прокси должен вести себя как сам сервис и для isinstance, и для специальных методов
+    @property
+    def __class__(self) -> type:
+        return type(self.value)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.value, name)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.value(*args, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.value
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.value[key]
+
+    def __enter__(self) -> Any:
+        return self.value.__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self.value.__exit__(exc_type, exc_val, exc_tb)
+
+    async def __aenter__(self) -> Any:
+        return await self.value.__aenter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return await self.value.__aexit__(exc_type, exc_val, exc_tb)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is Lazy:
+            other = other.value
+        return self.value == other
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __bool__(self) -> bool:
+        return bool(self.value)
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+    def __repr__(self) -> str:
+        if self._instance is _MISSING:
+            return 'Lazy(<unresolved>)'
+        return f'Lazy({self._instance!r})'
+
+
+class Provider(Generic[T]):
+    # Фабрика: каждый вызов разрешает зависимость заново с учётом её LifeStyle
+    __slots__ = ('_factory',)
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+
+    def __call__(self) -> T:
+        return self._factory()
+
+
+class Scope:
+    def __init__(self, scoped_instances: ContextVar[Optional['Scope']]):
+        self._scoped_instances = scoped_instances
+        self._token: Optional[Token] = None
+        self.instances: dict[Type, Any] = {}
+        self.closed = False
+
+    def __enter__(self) -> 'Scope':
+        self._token = self._scoped_instances.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        # Lazy-прокси могут пережить скоуп, но создавать в нём экземпляры уже нельзя
+        self.closed = True
+        errors = []
+        try:
+            for instance in reversed(list(self.instances.values())):
+                close = getattr(instance, 'close', None)
+                if not callable(close):
+                    continue
+                try:
+                    result = close()
+                    if isawaitable(result):
+                        if hasattr(result, 'close'):
+                            result.close()
+                        raise RuntimeError(
+                            f'{_name(type(instance))}.close() is asynchronous, use `async with create_scope()`'
+                        )
+                except Exception as e:
+                    errors.append(e)
+        finally:
+            self._scoped_instances.reset(self._token)
+        self._raise(errors, exc_val)
+
+    async def __aenter__(self) -> 'Scope':
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.closed = True
+        errors = []
+        try:
+            for instance in reversed(list(self.instances.values())):
+                close = getattr(instance, 'aclose', None) or getattr(instance, 'close', None)
+                if not callable(close):
+                    continue
+                try:
+                    result = close()
+                    if isawaitable(result):
+                        await result
+                except Exception as e:
+                    errors.append(e)
+        finally:
+            self._scoped_instances.reset(self._token)
+        self._raise(errors, exc_val)
+
+    @staticmethod
+    def _raise(errors: list[Exception], exc_val: Optional[BaseException]):
+        # Ошибка одного экземпляра не должна мешать освобождению остальных.
+        # Если упало тело скоупа, пробрасывается его исключение, а ошибки освобождения идут в заметки
+        if exc_val is not None:
+            for error in errors:
+                exc_val.add_note(f'Failed to dispose scoped instance: {error!r}')
+            return
+        if len(errors) == 1:
+            raise errors[0]
+        if errors:
+            raise ExceptionGroup('Failed to dispose scoped instances', errors)
+
+
+class ResolutionHooksProtocol(Protocol):
+    def on_resolve_start(self, interface: Type) -> None: ...
+    # cached: None для PER_REQUEST, иначе был ли экземпляр уже в кэше
+    def on_resolve_end(self, interface: Type, cached: Optional[bool]) -> None: ...
+
+
+class ResolutionStats:
+    __slots__ = ('count', 'hits', 'lookups', 'cumulative', 'self_time')
+
+    def __init__(self):
+        self.count = 0
+        self.hits = 0
+        self.lookups = 0
+        self.cumulative = 0.0
+        self.self_time = 0.0
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        return self.hits / self.lookups if self.lookups else None
+
+    def copy(self) -> 'ResolutionStats':
+        stats = ResolutionStats()
+        for name in self.__slots__:
+            setattr(stats, name, getattr(self, name))
+        return stats
+
+
+class ResolutionProfiler(ResolutionHooksProtocol):
+    def __init__(self):
+        self.stats: dict[Type, ResolutionStats] = {}
+        self.roots: set[Type] = set()
+        self.edges: dict[Type, set[Type]] = {}
+        self._lock = Lock()
+        self._local = local()
+
+    def _stack(self) -> list[list]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def on_resolve_start(self, interface: Type) -> None:
+        # [интерфейс, время начала, время, ушедшее на дочерние зависимости]
+        self._stack().append([interface, perf_counter(), 0.0])
+
+    def on_resolve_end(self, interface: Type, cached: Optional[bool]) -> None:
+        stack = self._stack()
+        _, start, children = stack.pop()
+        elapsed = perf_counter() - start
+        parent = stack[-1] if stack else None
+        if parent is not None:
+            parent[2] += elapsed
+
+        with self._lock:
+            stats = self.stats.get(interface)
+            if stats is None:
+                stats = self.stats[interface] = ResolutionStats()
+            stats.count += 1
+            stats.cumulative += elapsed
+            stats.self_time += elapsed - children
+            if cached is not None:
+                stats.lookups += 1
+                stats.hits += cached
+            if parent is None:
+                self.roots.add(interface)
+            else:
+                self.edges.setdefault(parent[0], set()).add(interface)
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.roots.clear()
+            self.edges.clear()
+
+    def snapshot(self) -> tuple[dict[Type, ResolutionStats], set[Type], dict[Type, set[Type]]]:
+        # on_resolve_end меняет данные из других потоков, поэтому отчёты строятся по копии
+        with self._lock:
+            return (
+                {interface: stats.copy() for interface, stats in self.stats.items()},
+                set(self.roots),
+                {interface: set(children) for interface, children in self.edges.items()},
+            )
+
+    def dependency_tree(self, root: Optional[Type] = None) -> dict[str, dict]:
+        _, roots, edges = self.snapshot()
+
+        def subtree(interface: Type, path: frozenset) -> dict[str, dict]:
+            children = edges.get(interface, ())
+            return {
+                _name(child): subtree(child, path | {child})
+                for child in children if child not in path
+            }
+
+        roots = [root] if root is not None else roots
+        return {_name(interface): subtree(interface, frozenset([interface])) for interface in roots}
+
+    def slowest(self, limit: int = 10, by: str = 'self_time') -> list[tuple[Type, ResolutionStats]]:
+        stats, _, _ = self.snapshot()
+        return sorted(stats.items(), key=lambda item: getattr(item[1], by), reverse=True)[:limit]
+
+    def report(self, limit: int = 10, by: str = 'self_time') -> str:
+        lines = [f'{"service":<24}{"count":>8}{"cum, ms":>12}{"self, ms":>12}{"hit rate":>10}']
+        for interface, stats in self.slowest(limit, by):
+            hit_rate = '-' if stats.hit_rate is None else f'{stats.hit_rate:.0%}'
+            lines.append(
+                f'{_name(interface):<24}{stats.count:>8}{stats.cumulative * 1e3:>12.3f}'
+                f'{stats.self_time * 1e3:>12.3f}{hit_rate:>10}'
+            )
+        return '\n'.join(lines)
+
+
 class Injector:
     _registry: dict[Type, tuple[Union[Type, Callable], LifeStyle, dict]]
     _singletons: dict[Type, Any]
+    _plans: dict[Type, Callable[[], Any]]
 
     def __init__(self):
         self._registry = {}
         self._singletons = {}
-        self._scoped_instances: Optional[dict[Type, Any]] = None
+        self._plans = {}
+        self._lazy: set[Type] = set()
+        self._singleton_locks: dict[Type, RLock] = {}
+        self._hooks: Optional[ResolutionHooksProtocol] = None
+        # Свой скоуп у каждого потока и каждой asyncio-задачи
+        self._scoped_instances: ContextVar[Optional[Scope]] = ContextVar(
+            f'scoped_instances_{id(self)}', default=None
+        )
 
     def register(
             self,
             interface: Type,
             implementation: Union[Type, Callable],
             lifestyle: LifeStyle = LifeStyle.PER_REQUEST,
-            params: Optional[dict] = None
+            params: Optional[dict] = None,
+            lazy: bool = False
     ):
         self._registry[interface] = (implementation, lifestyle, params or {})
+        # Зависимые сервисы получат Lazy-прокси вместо готового экземпляра
+        if lazy:
+            self._lazy.add(interface)
+        else:
+            self._lazy.discard(interface)
+        # Планы ссылаются на другие регистрации, поэтому сбрасываем все
+        self._plans.clear()
 
     def get_instance(self, interface: Type) -> Any:
-        impl, lifestyle, params = self._registry[interface]
-
-        if lifestyle == LifeStyle.SINGLETON:
-            if interface not in self._singletons:
-                self._singletons[interface] = self._build(impl, params)
-            return self._singletons[interface]
-
-        if lifestyle == LifeStyle.SCOPED:
-            if self._scoped_instances is None:
-                raise RuntimeError('No active scope')
-            if interface not in self._scoped_instances:
-                self._scoped_instances[interface] = self._build(impl, params)
-            return self._scoped_instances[interface]
-
-        return self._build(impl, params)
-
-    def _build(self, impl: Union[Type, Callable], params: dict) -> Any:
+        plan = self._plans.get(interface)
+        if plan is None:
+            plan = self._compile(interface)
+        return plan()
+
+    def set_hooks(self, hooks: Optional[ResolutionHooksProtocol]):
+        # Хуки встраиваются в планы при компиляции, без них планы не меняются
+        self._hooks = hooks
+        self._plans.clear()
+
+    def validate(self) -> list[str]:
+        problems = []
+        graph = {}
+        captured = {}
+        for interface, (impl, lifestyle, params) in self._registry.items():
+            deps = self._dependencies(impl, params)
+            graph[interface] = [dep for _, dep, wrapper in deps if wrapper is None]
+            captured[interface] = [dep for _, dep, wrapper in deps if wrapper is not Provider]
+            for name, annotation in self._unresolved(impl, params):
+                problems.append(
+                    f'{_name(interface)}: parameter {name!r} ({_name(annotation)}) is not registered'
+                )
+
+        # Поиск циклов обходом в глубину: 1 - в обработке, 2 - обработан.
+        # Lazy и Provider разрывают цикл, поэтому в graph их нет
+        state: dict[Type, int] = {}
+        path: list[Type] = []
+
+        def visit(interface: Type):
+            state[interface] = 1
+            path.append(interface)
+            for dep in graph[interface]:
+                if state.get(dep) == 1:
+                    cycle = path[path.index(dep):] + [dep]
+                    problems.append('Cyclic dependency: ' + ' -> '.join(map(_name, cycle)))
+                elif dep not in state:
+                    visit(dep)
+            path.pop()
+            state[interface] = 2
+
+        for interface in graph:
+            if interface not in state:
+                visit(interface)
+
+        # Синглтон не должен захватывать SCOPED-зависимость, даже через PER_REQUEST
+        for interface, (_, lifestyle, _) in self._registry.items():
+            if lifestyle != LifeStyle.SINGLETON:
+                continue
+            seen = set()
+            stack = list(captured[interface])
+            while stack:
+                dep = stack.pop()
+                if dep in seen:
+                    continue
+                seen.add(dep)
+                dep_lifestyle = self._registry[dep][1]
+                if dep_lifestyle == LifeStyle.SCOPED:
+                    problems.append(
+                        f'Captive dependency: singleton {_name(interface)} depends on scoped {_name(dep)}'
+                    )
+                elif dep_lifestyle == LifeStyle.PER_REQUEST:
+                    stack.extend(captured[dep])
+        return problems
+
+    def build(self, warm_up: bool = True, max_workers: Optional[int] = None) -> dict[Type, float]:
+        problems = self.validate()
+        if problems:
+            raise RuntimeError('Invalid container configuration:\n  ' + '\n  '.join(problems))
+        for interface in self._registry:
+            if interface not in self._plans:
+                self._compile(interface)
+        if not warm_up:
+            return {}
+
+        # Синглтоны одного уровня не зависят друг от друга и строятся параллельно
+        levels: dict[Type, int] = {}
+
+        def level(interface: Type) -> int:
+            if interface not in levels:
+                impl, _, params = self._registry[interface]
+                deps = self._dependencies(impl, params)
+                levels[interface] = 1 + max(
+                    (level(dep) for _, dep, wrapper in deps if wrapper is None), default=-1
+                )
+            return levels[interface]
+
+        by_level: dict[int, list[Type]] = {}
+        for interface, (_, lifestyle, _) in self._registry.items():
+            if lifestyle == LifeStyle.SINGLETON and interface not in self._singletons:
+                by_level.setdefault(level(interface), []).append(interface)
+
+        def construct(interface: Type) -> float:
+            start = perf_counter()
+            self.get_instance(interface)
+            return perf_counter() - start
+
+        timings = {}
+        with ThreadPoolExecutor(max_workers) as executor:
+            for _, interfaces in sorted(by_level.items()):
+                timings.update(zip(interfaces, executor.map(construct, interfaces)))
+        return timings
+
+    def _dependency(self, annotation: Any) -> Optional[tuple[Type, Optional[type]]]:
+        if annotation in self._registry:
+            return annotation, Lazy if annotation in self._lazy else None
+        wrapper = get_origin(annotation)
+        if wrapper in (Lazy, Provider) and get_args(annotation)[0] in self._registry:
+            return get_args(annotation)[0], wrapper
+        return None
+
+    def _dependencies(
+            self,
+            impl: Union[Type, Callable],
+            params: dict
+    ) -> list[tuple[str, Type, Optional[type]]]:
         if callable(impl) and not isclass(impl):
-            return impl()
+            return []
 
-        ctor_params = {}
+        deps = []
         sig = signature(impl.__init__)
         for name, param in sig.parameters.items():
-            if param.annotation in self._registry:
-                ctor_params[name] = self.get_instance(param.annotation)
-        ctor_params.update(params)
-        return impl(**ctor_params)
-
-    @contextmanager
-    def create_scope(self):
-        previous = self._scoped_instances
-        self._scoped_instances = {}
-        try:
-            yield
-        finally:
-            self._scoped_instances = previous
+            dependency = self._dependency(param.annotation)
+            if dependency is not None and name not in params:
+                deps.append((name, *dependency))
+        return deps
+
+    def _unresolved(self, impl: Union[Type, Callable], params: dict) -> list[tuple[str, Any]]:
+        if callable(impl) and not isclass(impl):
+            return []
+
+        unresolved = []
+        for name, param in list(signature(impl.__init__).parameters.items())[1:]:
+            if param.kind in (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD):
+                continue
+            if param.default is Parameter.empty and name not in params \
+                    and self._dependency(param.annotation) is None:
+                unresolved.append((name, param.annotation))
+        return unresolved
+
+    def _compile(self, interface: Type) -> Callable[[], Any]:
+        if interface not in self._registry:
+            raise KeyError(f'{_name(interface)} is not registered')
+        impl, lifestyle, params = self._registry[interface]
+        factory = self._compile_factory(impl, params)
+
+        if lifestyle == LifeStyle.SINGLETON:
+            singletons = self._singletons
+            lock = self._singleton_locks.setdefault(interface, RLock())
+
+            def plan():
+                if interface in singletons:
+                    return singletons[interface]
+                with lock:
+                    if interface not in singletons:
+                        singletons[interface] = factory()
+                    return singletons[interface]
+        elif lifestyle == LifeStyle.SCOPED:
+            scoped_instances = self._scoped_instances
+
+            def plan():
+                scope = scoped_instances.get()
+                if scope is None or scope.closed:
+                    raise RuntimeError('No active scope')
+                instances = scope.instances
+                if interface not in instances:
+                    instances[interface] = factory()
+                return instances[interface]
+        else:
+            plan = factory
+
+        if self._hooks is not None:
+            plan = self._instrument(interface, lifestyle, plan, self._hooks)
+        self._plans[interface] = plan
+        return plan
+
+    def _instrument(
+            self,
+            interface: Type,
+            lifestyle: LifeStyle,
+            plan: Callable[[], Any],
+            hooks: ResolutionHooksProtocol
+    ) -> Callable[[], Any]:
+        singletons = self._singletons
+        scoped_instances = self._scoped_instances
+
+        def instrumented():
+            if lifestyle == LifeStyle.SINGLETON:
+                cached = interface in singletons
+            elif lifestyle == LifeStyle.SCOPED:
+                scope = scoped_instances.get()
+                cached = scope is not None and interface in scope.instances
+            else:
+                cached = None
+            hooks.on_resolve_start(interface)
+            try:
+                return plan()
+            finally:
+                hooks.on_resolve_end(interface, cached)
+        return instrumented
+
+    def _compile_factory(self, impl: Union[Type, Callable], params: dict) -> Callable[[], Any]:
+        if callable(impl) and not isclass(impl):
+            return impl
+
+        get_instance = self.get_instance
+        resolvers = {
+            None: get_instance,
+            Lazy: self._lazy_proxy,
+            Provider: lambda dep: Provider(partial(get_instance, dep)),
+        }
+        deps = [
+            (name, dep, resolvers[wrapper])
+            for name, dep, wrapper in self._dependencies(impl, params)
+        ]
+
+        if not deps:
+            if not params:
+                return impl
+            return lambda: impl(**params)
+
+        def factory():
+            ctor_params = {name: resolve(dep) for name, dep, resolve in deps}
+            ctor_params.update(params)
+            return impl(**ctor_params)
+        return factory
+
+    def _lazy_proxy(self, interface: Type) -> Lazy:
+        # Запоминаем текущий скоуп, чтобы SCOPED-зависимость взялась из него,
+        # в каком бы потоке прокси ни разрешился
+        scoped_instances = self._scoped_instances
+        scope = scoped_instances.get()
+
+        def resolve():
+            token = scoped_instances.set(scope)
+            try:
+                return self.get_instance(interface)
+            finally:
+                scoped_instances.reset(token)
+        return Lazy(resolve)
+
+    def create_scope(self) -> Scope:
+        # Поддерживает и `with`, и `async with`
+        return Scope(self._scoped_instances)
 
 class IServiceA(ABC):
     @abstractmethod
@@ -161,6 +668,9 @@ config3.register(IServiceB, ServiceBDebug, LifeStyle.SCOPED)
 config3.register(IServiceC, ServiceCDebug, LifeStyle.SINGLETON)
 
 def demo(injector: Injector):
+    for problem in injector.validate():
+        print(f'[VALIDATE] {problem}')
+
     print('---- New Request ----')
     a1 = injector.get_instance(IServiceA)
     a2 = injector.get_instance(IServiceA)
@@ -186,4 +696,15 @@ if __name__ == '__main__':
     demo(config2)
 
     print('\n== Config 3 (с параметрами) ==')
-    demo(config3)
\ No newline at end of file
+    demo(config3)
+
+    print('\n== Профилирование Config 1 ==')
+    profiler = ResolutionProfiler()
+    config1.set_hooks(profiler)
+    for _ in range(100):
+        with config1.create_scope():
+            config1.get_instance(IServiceC)
+            config1.get_instance(IServiceB)
+    config1.set_hooks(None)
+    print(profiler.report())
+    print(profiler.dependency_tree())
\ No newline at end of file